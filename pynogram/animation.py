@@ -14,10 +14,7 @@ try:
 except ImportError:
     curses = None
 
-from six import (
-    string_types,
-    itervalues,
-)
+from six import string_types
 from six.moves import queue
 
 from pynogram.core.renderer import BaseAsciiRenderer
@@ -48,7 +45,10 @@ class StringsPager(object):
         self.source_queue = source_queue
         self.restart_on = restart_on
 
-        self.lines = dict()
+        # the line for every row index
+        self.lines = []
+        # the same lines, encoded to be passed to curses as is
+        self.encoded_lines = []
         self.row_index = 0
         self._current_start_index = 0
 
@@ -104,7 +104,7 @@ class StringsPager(object):
         if not self.lines:
             return
 
-        max_len = max(len(line) for line in itervalues(self.lines))
+        max_len = max(len(line) for line in self.lines)
         # we should not hide more than a third of the lines
         # if some spaces are presented further to the right
         allow_to_hide = 0  # int(max_len / 3)
@@ -141,10 +141,20 @@ class StringsPager(object):
 
         self._current_start_index = value
 
-    def put_line(self, line, y_position=None, x_offset=0, start_index=None):
+    @classmethod
+    def encode(cls, line):
+        """Prepare the line to be drawn by curses"""
+        if isinstance(line, string_types):
+            return line.encode('UTF-8')
+        return line
+
+    def put_line(self, line, y_position=None, x_offset=0, start_index=None, encoded=None):
         """
         Draws the line on the current position
         (if it is within visible area)
+
+        The already encoded line can be specified to draw it without cutting
+        if the whole line fits in the screen.
         """
 
         if y_position is None:
@@ -156,14 +166,11 @@ class StringsPager(object):
         height, width = self.window_size
         # only draw if will be visible on a screen
         if 0 <= y_position <= height - 1:
-            if start_index != 0:
-                line = line[start_index:]
-
-            # to fit in the screen
-            line = line[:width - 1]
-
-            if isinstance(line, string_types):
-                line = line.encode('UTF-8')
+            if encoded is not None and start_index == 0 and len(line) < width:
+                line = encoded
+            else:
+                # to fit in the screen
+                line = self.encode(line[start_index:][:width - 1])
 
             self.window.addstr(y_position, x_offset, line)
 
@@ -183,17 +190,29 @@ class StringsPager(object):
 
     def redraw(self):
         """
-        Redraw the whole screen from cached lines
+        Redraw the whole screen from cached lines.
+        The visible part of the page is drawn with a single call.
         """
-        save_index = self.row_index
+        height, width = self.window_size
+        start_index = self.current_start_index
+        vertical_offset = self.vertical_offset
 
-        self.row_index = 0
-        self.window.clear()
-        for _, line in sorted(self.lines.items()):
-            self.put_line(line)
-            self.line_feed()
+        visible = slice(vertical_offset, vertical_offset + height)
+        visible_lines = self.lines[visible]
+
+        # every line is cut to fit in the screen, so newlines never overflow it
+        if start_index == 0 and all(len(line) < width for line in visible_lines):
+            frame = b'\n'.join(self.encoded_lines[visible])
+        else:
+            frame = self.encode('\n'.join(
+                line[start_index:][:width - 1] for line in visible_lines))
 
-        self.row_index = save_index
+        self.window.erase()
+        if frame:
+            self.window.addstr(0, 0, frame)
+
+        # the cursor stays after the last line as if they were drawn one by one
+        self.move_cursor(len(self.lines) - vertical_offset, 0)
 
     def update(self):
         """
@@ -212,13 +231,18 @@ class StringsPager(object):
             return False
 
         redraw = False
-        old_line = self.lines.get(line)
-        if old_line != line:
-            self.lines[self.row_index] = line
+        if self.row_index < len(self.lines):
+            if self.lines[self.row_index] != line:
+                self.lines[self.row_index] = line
+                self.encoded_lines[self.row_index] = self.encode(line)
+                redraw = True
+        else:
+            self.lines.append(line)
+            self.encoded_lines.append(self.encode(line))
             redraw = True
 
         if redraw:
-            self.put_line(line)
+            self.put_line(line, encoded=self.encoded_lines[self.row_index])
 
         self.line_feed()
         return redraw
@@ -303,6 +327,10 @@ class CursesRenderer(BaseAsciiRenderer):
         for arg in args:
             self.stream.put(arg)
 
+    def _print_lines(self, lines):
+        # the pager expects a separate item for every line
+        self._print(*lines)
+
     def render(self):
         # clear the screen before next board
         self._print(self.separator)
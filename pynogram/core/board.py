@@ -19,7 +19,6 @@ from collections import (
 )
 from copy import copy
 
-from memoized import memoized
 from six.moves import zip, range, map
 
 try:
@@ -49,6 +48,7 @@ from pynogram.utils.other import (
     two_powers, from_two_powers,
     get_named_logger,
     ignored,
+    lru_cache,
 )
 
 LOG = get_named_logger(__name__, __file__)
@@ -816,23 +816,55 @@ class BlackBoard(BaseBoard):
     def normalize(self, clues):
         return tuple(map(normalize_description, clues))
 
+    @classmethod
+    def _need_cells(cls, descriptions):
+        """
+        The minimum number of cells to allocate every clue:
+        all the boxes plus at least one space between every two blocks
+        """
+        if np is None:
+            return [sum(clue) + max(len(clue) - 1, 0) for clue in descriptions]
+
+        lengths = np.fromiter(map(len, descriptions), dtype=np.int32)
+        boxes = np.fromiter(
+            (block for clue in descriptions for block in clue),
+            dtype=np.int32, count=int(lengths.sum()))
+
+        # the boxes of i-th clue is a slice between two partial sums
+        sums = np.concatenate(([0], boxes.cumsum()))
+        ends = lengths.cumsum()
+        return sums[ends] - sums[ends - lengths] + np.maximum(lengths - 1, 0)
+
+    @classmethod
+    def _boxes_total(cls, descriptions):
+        if np is None:
+            return sum(sum(clue) for clue in descriptions)
+
+        return int(np.fromiter(
+            (block for clue in descriptions for block in clue),
+            dtype=np.int32).sum())
+
     @classmethod
     def validate_descriptions_size(cls, descriptions, max_size):
-        for clue in descriptions:
-            need_cells = sum(clue)
-            if clue:
-                # also need at least one space between every two blocks
-                need_cells += len(clue) - 1
+        descriptions = list(descriptions)
+        if not descriptions:
+            return
 
-            LOG.debug('Clue: %s; Need: %s; Available: %s.',
-                      clue, need_cells, max_size)
-            if need_cells > max_size:
-                raise ValueError('Cannot allocate clue {} in just {} cells'.format(
-                    list(clue), max_size))
+        need_cells = cls._need_cells(descriptions)
+        LOG.debug('Need cells: %s; Available: %s.', need_cells, max_size)
+
+        if np is None:
+            too_long = [index for index, need in enumerate(need_cells) if need > max_size]
+        else:
+            too_long = np.flatnonzero(need_cells > max_size)
+
+        if len(too_long):
+            raise ValueError('Cannot allocate clue {} in just {} cells'.format(
+                list(descriptions[too_long[0]]), max_size))
 
     def validate_colors(self, vertical, horizontal):
-        boxes_in_columns = sum(sum(block) for block in vertical)
-        boxes_in_rows = sum(sum(block) for block in horizontal)
+        boxes_in_columns = self._boxes_total(vertical)
+        boxes_in_rows = self._boxes_total(horizontal)
         if boxes_in_rows != boxes_in_columns:
             raise ValueError('Number of boxes differs: {} (rows) and {} (columns)'.format(
                 boxes_in_rows, boxes_in_columns))
@@ -1264,7 +1296,7 @@ class ColorBoard(BaseBoard, ReduceColorToBlackMixin):
     # ATTENTION: be aware not to change the result of memoized function
     # as it can affect all the future invocations
     @staticmethod  # much more efficient memoization (compared to @classmethod)
-    @memoized
+    @lru_cache(maxsize=None)
     def cell_as_color_set(cell_value):
         """Represent a numbered color as a set of individual colors"""
         return set(two_powers(cell_value))
@@ -12,8 +12,7 @@ except ImportError:
     Enum = object
 
 from six import (
-    integer_types, string_types,
-    iteritems,
+    integer_types, string_types, text_type,
     with_metaclass,
 )
 from six.moves import range
@@ -22,7 +21,6 @@ from pynogram.core.color import (
     Color, ColorBlock,
 )
 from pynogram.utils.iter import (
-    list_replace,
     expand_generator,
 )
 from pynogram.utils.other import get_named_logger
@@ -73,6 +71,52 @@ def invert(cell_state):
     return cell_state
 
 
+def _description_from_string(row, color):
+    blocks = row.split()
+    if color:
+        return tuple(blocks)
+    return tuple(map(int, blocks))
+
+
+def _description_from_int(row, _color):
+    return row,  # it's a tuple!
+
+
+def _description_from_sequence(row, _color):
+    return tuple(row)
+
+
+_DESCRIPTION_BY_TYPE = {
+    tuple: _description_from_sequence,
+    list: _description_from_sequence,
+    int: _description_from_int,
+    str: _description_from_string,
+    text_type: _description_from_string,
+}
+
+
+def _description_normalizer(row):
+    """
+    Choose the normalizer for the row which type
+    is not found in `_DESCRIPTION_BY_TYPE` (e.g. a subclass of known types)
+    """
+    if isinstance(row, (tuple, list)):
+        return _description_from_sequence
+
+    if isinstance(row, integer_types):
+        return _description_from_int
+
+    if isinstance(row, string_types):
+        return _description_from_string
+
+    raise ValueError('Bad row: %s' % row)
+
+
+# every distinct black-and-white description is stored only once,
+# so equal clues share the same tuple object (cheaper hashing and less memory)
+_DESC_INTERN = {}
+
+
 def normalize_description(row, color=False):
     """
     Normalize a nonogram description for a row to the standard tuple format:
@@ -80,23 +124,23 @@ def normalize_description(row, color=False):
     - tuple or list becomes simply the same tuple
     - single number becomes a tuple with one item
     - a string of space-separated numbers becomes a tuple of that numbers
+
+    Equal black-and-white descriptions are returned as the same tuple object.
     """
     if not row:  # None, 0, '', [], ()
         return ()
 
-    if isinstance(row, (tuple, list)):
-        return tuple(row)
-
-    if isinstance(row, integer_types):
-        return row,  # it's a tuple!
+    # the exact type lookup is much faster than the chain of `isinstance`
+    normalizer = _DESCRIPTION_BY_TYPE.get(type(row))
+    if normalizer is None:
+        normalizer = _description_normalizer(row)
 
-    if isinstance(row, string_types):
-        blocks = row.split()
-        if color:
-            return tuple(blocks)
-        return tuple(map(int, blocks))
+    result = normalizer(row, color)
+    if color:
+        # colored blocks can be unhashable (lists), they get normalized later
+        return result
 
-    raise ValueError('Bad row: %s' % row)
+    return _DESC_INTERN.setdefault(result, result)
 
 
 INFORMAL_REPRESENTATIONS = {
@@ -107,6 +151,12 @@ INFORMAL_REPRESENTATIONS = {
 
 FORMAL_ALPHABET = set(INFORMAL_REPRESENTATIONS)
 
+_INFORMAL_TO_FORMAL = dict(
+    (informal, formal)
+    for formal, informal_symbols in INFORMAL_REPRESENTATIONS.items()
+    for informal in informal_symbols
+)
+
 
 def normalize_row(row):
     """
@@ -120,27 +170,24 @@ def normalize_row(row):
         return row
 
     LOG.debug('All row symbols: %s', alphabet)
-    # save original for logs and debug
-    original, row = row, list(row)
 
-    for formal, informal in iteritems(INFORMAL_REPRESENTATIONS):
-        informal = set(informal) & alphabet
-        if not informal:
-            LOG.debug('Not found %r in a row', formal)
-            continue
+    representations = dict()
+    for symbol in alphabet:
+        if symbol in _INFORMAL_TO_FORMAL:
+            formal = _INFORMAL_TO_FORMAL[symbol]
+            representations.setdefault(formal, []).append(symbol)
 
+    for formal, informal in representations.items():
         if len(informal) > 1:
             raise ValueError(
                 "Cannot contain different representations '{}' "
                 "of the same state '{}' in a single row '{}'".format(
-                    ', '.join(sorted(informal)), formal, original))
+                    ', '.join(sorted(informal)), formal, row))
 
-        informal = informal.pop()
-        LOG.debug('Replace %r with a %r', informal, formal)
-        list_replace(row, informal, formal)
+    row = tuple(_INFORMAL_TO_FORMAL.get(cell, cell) for cell in row)
 
     assert set(row).issubset(FORMAL_ALPHABET)
-    return tuple(row)
+    return row
 
 
 def is_list_like(value):
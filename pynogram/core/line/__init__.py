@@ -14,6 +14,7 @@ from pynogram.core.line import (
     machine,
     simpson,
 )
+from pynogram.utils.other import terminating_mp_pool
 
 # TODO: choose the method for each registered solver
 SOLVERS = {
@@ -59,6 +60,47 @@ def solve_line(desc, line, method='reverse_tracking', normalized=False):
     return solver.solve(desc, line)
 
 
+def _solve_line_task(args):
+    # mp's map supports only one iterable, so pack all the arguments into the tuple
+    desc, line, method = args
+    return solve_line(desc, line, method=method, normalized=True)
+
+
+def solve_lines_batch(descriptions, lines, method='reverse_tracking',
+                      processes=None, chunk_size=64):
+    """
+    Solve a bunch of independent lines (e.g. all the rows of a board)
+    using the pool of processes.
+
+    The lines with the same description are sent to the workers
+    one after another, so every worker can reuse its caches.
+
+    Return the solved lines in the order of the given ones.
+    """
+    if method not in SOLVERS:
+        raise KeyError("Cannot find solver '%s'" % method)
+
+    descriptions = [normalize_description(desc) for desc in descriptions]
+    lines = [normalize_row(line) for line in lines]
+    if len(descriptions) != len(lines):
+        raise ValueError('Got {} descriptions for {} lines'.format(
+            len(descriptions), len(lines)))
+
+    by_description = dict()
+    for index, desc in enumerate(descriptions):
+        by_description.setdefault(desc, []).append(index)
+
+    order = [index for indexes in by_description.values() for index in indexes]
+    tasks = [(descriptions[index], lines[index], method) for index in order]
+
+    solved = [None] * len(lines)
+    with terminating_mp_pool(processes) as pool:
+        for index, line in zip(order, pool.imap(_solve_line_task, tasks, chunk_size)):
+            solved[index] = line
+
+    return solved
+
+
 # TODO: automatically set the log level for each registered solver
 def _set_solvers_log_level(level=logging.WARNING):
     machine.LOG.setLevel(level)
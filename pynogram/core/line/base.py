@@ -5,10 +5,7 @@ from __future__ import unicode_literals, print_function
 
 import logging
 
-from six import (
-    iteritems, itervalues,
-    add_metaclass,
-)
+from six import add_metaclass
 
 from pynogram.core.common import (
     NonogramError,
@@ -24,15 +21,22 @@ LOG = logging.getLogger(__name__)
 class TwoLayerCache(Cache):
     """
     Special cache for storing nonograms line solutions.
-    The keys are pairs (clue, partial_solution)
+    The keys are pairs (clue, partial_solution).
+    When the cache is full, all the solutions for the least recently used clue get dropped.
     """
 
     def __len__(self):
-        return sum(len(lines) for lines in itervalues(self._storage))
+        return sum(len(lines) for lines in self._storage.values())
+
+    def __contains__(self, name):
+        clue, prev_line = name
+        return prev_line in self._storage.get(clue, ())
 
     def _save(self, name, value, **kwargs):
         clue, prev_line = name
-        if clue not in self._storage:
+        if clue in self._storage:
+            self._refresh(clue)
+        else:
             self._storage[clue] = dict()
 
         self._storage[clue][prev_line] = value
@@ -43,6 +47,7 @@ class TwoLayerCache(Cache):
         if clue_solutions is None:
             return None
 
+        self._refresh(clue)
         return clue_solutions.get(prev_line)
 
     def delete(self, name):
@@ -73,7 +78,7 @@ def cache_info():
     """Cache size and hit rate for different solvers"""
     return {
         class_name: (len(cache), cache.hit_rate)
-        for class_name, cache in iteritems(LineSolutionsMeta.registered_caches)
+        for class_name, cache in LineSolutionsMeta.registered_caches.items()
     }
 
 
@@ -10,11 +10,20 @@ from __future__ import unicode_literals, print_function
 
 import logging
 
-from six import (
-    iteritems, itervalues,
-)
 from six.moves import range
 
+try:
+    # noinspection PyPackageRequirements
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # noinspection PyPackageRequirements
+    from numba import njit
+except ImportError:
+    njit = None
+
 from pynogram.core.common import (
     UNKNOWN, BOX, SPACE, SPACE_COLORED,
     normalize_description, normalize_row,
@@ -24,17 +33,91 @@ from pynogram.core.common import (
 from pynogram.core.line.base import BaseLineSolver
 from pynogram.core.line.simpson import FastSolver
 from pynogram.utils import fsm
-from pynogram.utils.cache import Cache
+from pynogram.utils.cache import Cache, init_once
 from pynogram.utils.iter import expand_generator
 from pynogram.utils.other import (
     two_powers, from_two_powers,
     get_named_logger,
+    lru_cache,
 )
 
 LOG = get_named_logger(__name__, __file__)
 
 fsm.LOG.setLevel(logging.WARNING)
 
+# the black-and-white FSM actions and cells encoded as small integers
+_KERNEL_ACTIONS = (BOX, SPACE)
+# the code of every action is its index in `_KERNEL_ACTIONS` plus one
+# as zero stands for the unknown cell
+_KERNEL_CELLS = (UNKNOWN,) + _KERNEL_ACTIONS
+_KERNEL_CELL_CODES = dict((cell, code) for code, cell in enumerate(_KERNEL_CELLS))
+
+
+def _reverse_tracking_kernel(transitions, initial_state, final_state, row):
+    """
+    The same reverse tracking as in `NonogramFSM.solve_with_reverse_tracking`
+    but in the form suitable for JIT-compiling.
+
+    :param transitions: int32 matrix of the new states for every (state, action)
+    or -1 when the transition is not possible
+    :param row: int8 array of the cells encoded with `_KERNEL_CELL_CODES`
+
+    Return the pair (whether the final state is reachable, solved row encoded as int8).
+    """
+    size = row.shape[0]
+    n_states, n_actions = transitions.shape
+
+    reachable = np.zeros((size + 1, n_states), dtype=np.bool_)
+    reachable[0, initial_state] = True
+    for i in range(size):
+        cell = row[i]
+        for state in range(n_states):
+            if not reachable[i, state]:
+                continue
+
+            for action in range(n_actions):
+                if cell != 0 and cell != action + 1:
+                    continue
+
+                new_state = transitions[state, action]
+                if new_state >= 0:
+                    reachable[i + 1, new_state] = True
+
+    solved = np.zeros(size, dtype=np.int8)
+    if not reachable[size, final_state]:
+        return False, solved
+
+    possible = np.zeros(n_states, dtype=np.bool_)
+    possible[final_state] = True
+    for i in range(size - 1, -1, -1):
+        cell = row[i]
+        prev_possible = np.zeros(n_states, dtype=np.bool_)
+        solved_code = -1
+        for state in range(n_states):
+            if not reachable[i, state]:
+                continue
+
+            for action in range(n_actions):
+                if cell != 0 and cell != action + 1:
+                    continue
+
+                new_state = transitions[state, action]
+                if new_state >= 0 and possible[new_state]:
+                    prev_possible[state] = True
+                    if solved_code == -1:
+                        solved_code = action + 1
+                    elif solved_code != action + 1:
+                        solved_code = 0
+
+        solved[i] = solved_code
+        possible = prev_possible
+
+    return True, solved
+
+
+if njit is not None:
+    _reverse_tracking_kernel = njit(cache=True)(_reverse_tracking_kernel)
+
 
 class NonogramFSM(fsm.FiniteStateMachine):
     """
@@ -223,38 +306,6 @@ class NonogramFSM(fsm.FiniteStateMachine):
 
         return ()
 
-    def _make_transition_table(self, row):
-        # for each read cell store a list of StepState
-        # plus O-th for the state before any read cells
-        transition_table = TransitionTable.with_capacity(len(row) + 1)
-        transition_table.append_transition(0, self.initial_state)
-
-        def _shift_one_cell(cell_type, trans_index,
-                            previous_step_state, previous_state, desc_cell=None):
-            if desc_cell:  # pragma: no cover
-                LOG.debug('Add states with %s transition', desc_cell)
-
-            new_state = self.reaction(cell_type, previous_state)
-            if new_state is None:
-                if desc_cell:  # pragma: no cover
-                    LOG.debug('Cannot go from %s with the %s cell', previous_state, desc_cell)
-            else:
-                transition_table.append_transition(
-                    trans_index, new_state, previous_step_state, cell_type)
-
-        # optimize lookups
-        _types_for_cell = self._types_for_cell
-
-        for i, cell in enumerate(row):
-            transition_index = i + 1
-
-            for prev_state, prev in iteritems(transition_table[i]):
-                for _type in _types_for_cell(cell):
-                    _shift_one_cell(_type, transition_index,
-                                    prev, prev_state)
-
-        return transition_table
-
     @classmethod
     def _cell_value_from_solved(cls, states):
         assert states
@@ -264,134 +315,139 @@ class NonogramFSM(fsm.FiniteStateMachine):
 
         return UNKNOWN
 
-    def solve_with_reverse_tracking(self, row):
+    @init_once
+    def _action_masks(self):
         """
-        Solve the nonogram `row` using the FSM and reverse tracking
+        For every action produce the pair of bit masks (loops, advances).
+        The i-th bit of `loops` is set when the state `i` remains the same
+        after the action, the i-th bit of `advances` is set
+        when the action moves the state `i` to the state `i + 1`.
+
+        Every nonogram state map consists only of such transitions,
+        so the whole set of possible states can be shifted with a couple of bit operations.
         """
-        if not self.description and self._can_be_empty(row):
-            return (self._space(),) * len(row)
+        masks = dict()
+        for (state, action), new_state in self.state_map.items():
+            loops, advances = masks.get(action, (0, 0))
+            if new_state == state:
+                loops |= 1 << state
+            elif new_state == state + 1:
+                advances |= 1 << state
+            else:
+                raise ValueError('Bad transition {!r} -> {!r}'.format(
+                    (state, action), new_state))
 
-        transition_table = self._make_transition_table(row)
+            masks[action] = loops, advances
 
-        # print(transition_table)
-        if self.final_state not in transition_table[-1]:
-            raise NonogramError('Bad transition table: final state {!r} not found'.format(
-                self.final_state))
+        return masks
 
-        reversed_states = list(transition_table.reverse_tracking(self.final_state))
-        solved_row = (
-            self._cell_value_from_solved(states)
-            for states in reversed(reversed_states))
+    @init_once
+    def _transitions_matrix(self):
+        """
+        The state map in the form of int32 matrix for `_reverse_tracking_kernel`
+        """
+        transitions = np.full(
+            (self.final_state + 1, len(_KERNEL_ACTIONS)), -1, dtype=np.int32)
 
-        return solved_row
+        for (state, action), new_state in self.state_map.items():
+            transitions[state, _KERNEL_ACTIONS.index(action)] = new_state
 
-    def match(self, word):
-        # special case for an empty description
-        if not self.description:
-            word = tuple(set(word))
-            if len(word) == 1:
-                space = word[0]
-                if space == self._space():
-                    return True
+        return transitions
 
-        return super(NonogramFSM, self).match(word)
+    def solve_with_kernel(self, row):
+        """
+        Solve the black-and-white nonogram `row`
+        using the (possibly compiled) `_reverse_tracking_kernel`
+        """
+        if np is None:
+            raise RuntimeError('The kernel solver requires numpy to be installed')
 
+        codes = _KERNEL_CELL_CODES
+        encoded = np.fromiter((codes[cell] for cell in row), dtype=np.int8, count=len(row))
 
-class _StepState(object):
-    """
-    Stores state of the machine,
-    the link to the previous StepState object
-    and the list of transitions which led to this state
-    """
+        matched, solved = _reverse_tracking_kernel(
+            self._transitions_matrix(), self.initial_state, self.final_state, encoded)
 
-    __slots__ = ['state', 'previous_states']
+        if not matched:
+            raise NonogramError('Bad transition table: final state {!r} not found'.format(
+                self.final_state))
+
+        cells = _KERNEL_CELLS
+        return [cells[code] for code in solved]
 
-    def __init__(self, state, prev=None, cell_type=None):
-        # self.id = id(self)
-        self.state = state
-        self.previous_states = dict()
-        self.add_previous_state(prev, cell_type)
+    # use the kernel only when it gets compiled, the pure python bit masks are faster
+    USE_KERNEL = njit is not None
 
-    def add_previous_state(self, prev, cell_type):
+    def solve_with_reverse_tracking(self, row):
         """
-        Add transition which led to the current StepState.
-        As a result it could be one or more pairs (StepState, cell_type).
+        Solve the nonogram `row` using the FSM and reverse tracking.
+
+        The sets of possible states are stored as bit masks:
+        firstly find all the states reachable after reading every cell,
+        then go back from the final state and leave only the states
+        (and the actions) that can lead to it.
         """
-        if prev is not None:
-            self.previous_states[prev] = cell_type
+        if not self.description and self._can_be_empty(row):
+            return (self._space(),) * len(row)
 
-    def __str__(self):
-        previous_states = sorted(
-            iteritems(self.previous_states),
-            key=lambda x: x[0].state)
+        if self.USE_KERNEL:
+            return self.solve_with_kernel(row)
 
-        return '({}): [{}]'.format(
-            # self.id,
-            self.state,
-            ', '.join('{}<-{}'.format(prev.state, cell_type)
-                      for prev, cell_type in previous_states))
+        # optimize lookups
+        masks = self._action_masks()
+        _types_for_cell = self._types_for_cell
 
+        # reachable[i] is for the states after reading i cells
+        reachable = [1 << self.initial_state]
+        states = reachable[0]
+        for cell in row:
+            new_states = 0
+            for _type in _types_for_cell(cell):
+                if _type not in masks:
+                    continue
 
-class TransitionTable(list):
-    """
-    Stores the map of all the transitions that
-    can be made with given automaton for given input row
-    """
+                loops, advances = masks[_type]
+                new_states |= (states & loops) | ((states & advances) << 1)
 
-    @classmethod
-    def with_capacity(cls, capacity):
-        """Generates a list of dicts with given capacity"""
-        return TransitionTable([dict() for _ in range(capacity)])
+            reachable.append(new_states)
+            states = new_states
 
-    def append_transition(self, cell_index, state, prev=None, cell_type=None):
-        """
-        Add transition that shifts from `prev` StepState
-        after reading `cell_index`-th cell from a row
-        (which value is `cell_type`)
-        to the new StepState of given `state`
-        """
-        transition_row = self[cell_index]
-        if state in transition_row:
-            # LOG.debug('State %s already exists in transition table for cell %s',
-            #           state, cell_index)
-            transition_row[state].add_previous_state(prev, cell_type)
-        else:
-            transition_row[state] = _StepState(state, prev, cell_type)
-
-    def __str__(self):
-        res = []
-        for i, states in enumerate(self):
-            if i > 0:
-                res.append('')
-            res.append(i)
-            res.extend(sorted(itervalues(states), key=lambda x: x.state))
-            # for state, step in iteritems(states):
-            #     res.append('({}): {}'.format(state, step))
-
-        return '\n'.join(map(str, res))
-
-    def reverse_tracking(self, final_state):
-        """
-        Find all the possible reverse ways.
+        states &= 1 << self.final_state
+        if not states:
+            raise NonogramError('Bad transition table: final state {!r} not found'.format(
+                self.final_state))
 
-        Yield the actions that the machine can do
-        on each step from final to initial.
-        """
-        possible_states = {final_state}
+        solved_row = [None] * len(row)
+        for i in range(len(row) - 1, -1, -1):
+            before = reachable[i]
 
-        # ignore the first row, it's for pre-read state
-        for row in reversed(self[1:]):
-            step_possible_cell_types = set()
-            step_possible_states = set()
+            cell_types = []
+            prev_states = 0
+            for _type in _types_for_cell(row[i]):
+                if _type not in masks:
+                    continue
 
-            for state in possible_states:
-                step = row[state]
-                for prev, cell_type in iteritems(step.previous_states):
-                    step_possible_cell_types.add(cell_type)
-                    step_possible_states.add(prev.state)
+                loops, advances = masks[_type]
+                prev = before & ((states & loops) | ((states >> 1) & advances))
+                if prev:
+                    cell_types.append(_type)
+                    prev_states |= prev
 
-            possible_states = step_possible_states
-            yield tuple(step_possible_cell_types)
+            solved_row[i] = self._cell_value_from_solved(cell_types)
+            states = prev_states
+
+        return solved_row
+
+    def match(self, word):
+        # special case for an empty description
+        if not self.description:
+            word = tuple(set(word))
+            if len(word) == 1:
+                space = word[0]
+                if space == self._space():
+                    return True
+
+        return super(NonogramFSM, self).match(word)
 
 
 class NonogramFSMColored(NonogramFSM):
@@ -399,6 +455,9 @@ class NonogramFSMColored(NonogramFSM):
     FSM-based line solver for colored puzzles
     """
 
+    # the kernel only supports black-and-white cells
+    USE_KERNEL = False
+
     @classmethod
     def _space(cls):
         return SPACE_COLORED
@@ -436,7 +495,7 @@ class BaseMachineSolver(BaseLineSolver):
 
     def __init__(self, description, line):
         super(BaseMachineSolver, self).__init__(description, line)
-        self.nfsm = self.make_nfsm(description)
+        self.nfsm = _solving_nfsm(type(self), description)
 
     NFSM_CLASS = NonogramFSM
     FSM_CACHE = Cache(1000)
@@ -477,6 +536,19 @@ class BaseMachineSolver(BaseLineSolver):
         return cls.NFSM_CLASS(description, state_map)
 
 
+@lru_cache(maxsize=4096)
+def _solving_nfsm(solver_cls, description):
+    """
+    The machine to solve the lines with given description.
+    Many lines share the same description, so the machines
+    (along with their lazily calculated transition masks) are reused.
+
+    Do not change the state of the returned machine: it is shared between solvers.
+    Use `_solving_nfsm.cache_clear()` to start from scratch (e.g. for benchmarking).
+    """
+    return solver_cls.make_nfsm(description)
+
+
 class PartialMatchSolver(BaseMachineSolver):
     """
     FSM Nonogram solver that uses 'partial match' method (slow)
@@ -21,7 +21,6 @@ from sys import stdout
 
 from six import (
     integer_types, text_type,
-    iteritems, itervalues,
     PY2,
 )
 
@@ -160,6 +159,8 @@ class Renderer(object):
     def __init__(self, board=None):
         self.cells = None
         self.board = None
+        # the sizes of the clues blocks for the descriptions they calculated on
+        self._clues_sizes = dict()
         self.board_init(board)
 
     def board_init(self, board=None):
@@ -186,12 +187,31 @@ class Renderer(object):
     @property
     def header_height(self):
         """The size of the header block with columns descriptions"""
-        return max_safe(map(len, self.board.columns_descriptions), default=0)
+        return self._clues_size(True)
 
     @property
     def side_width(self):
         """The width of the side block with rows descriptions"""
-        return max_safe(map(len, self.board.rows_descriptions), default=0)
+        return self._clues_size(False)
+
+    def _clues_size(self, is_column):
+        """
+        The maximum number of blocks in a single clue.
+
+        Calculated again only when the board's descriptions get replaced.
+        """
+        if is_column:
+            descriptions = self.board.columns_descriptions
+        else:
+            descriptions = self.board.rows_descriptions
+
+        cached = self._clues_sizes.get(is_column)
+        if cached is not None and cached[0] is descriptions:
+            return cached[1]
+
+        size = max_safe(map(len, descriptions), default=0)
+        self._clues_sizes[is_column] = descriptions, size
+        return size
 
     def render(self):
         """Actually print out the board"""
@@ -249,6 +269,11 @@ class StreamRenderer(Renderer, ABC):
     def _print(self, *args):
         return print(*args, file=self.stream)
 
+    def _print_lines(self, lines):
+        """Print out the whole frame with a single write"""
+        if lines:
+            self.stream.write('\n'.join(lines) + '\n')
+
 
 class BaseAsciiRenderer(StreamRenderer):
     """
@@ -264,6 +289,11 @@ class BaseAsciiRenderer(StreamRenderer):
         self.cells = [[Cell()] * self.full_width
                       for _ in range(self.full_height)]
 
+        # the grid cells for every already seen value of the board's cells
+        self._grid_cells = dict()
+        # the rendered clues for columns (True) and rows (False)
+        self._clues = dict()
+
     def cell_icon(self, cell):
         """
         Get a symbolic representation of a cell given its state
@@ -271,61 +301,102 @@ class BaseAsciiRenderer(StreamRenderer):
         """
         return cell.ascii_icon()
 
+    def _row_icons(self, row, icons):
+        """
+        Get the icons for the row of rendered cells.
+
+        The same cell objects appear on a board many times,
+        so every icon is calculated only once and saved in the `icons` dict.
+        """
+        cell_icon = self.cell_icon
+
+        res = []
+        for cell in row:
+            ico = icons.get(cell)
+            if ico is None:
+                icons[cell] = ico = cell_icon(cell)
+            res.append(ico)
+
+        return res
+
     def render(self):
+        icons = dict()
+        lines = []
         for row in self.cells:
-            res = []
-            for index, cell in enumerate(row):
-                ico = self.cell_icon(cell)
+            row_icons = self._row_icons(row, icons)
+            last_index = len(row_icons) - 1
 
-                # do not pad the last symbol in a line
-                if len(ico) == 1:
-                    if index < len(row) - 1:
-                        ico += ' '
+            # do not pad the last symbol in a line
+            lines.append(''.join(
+                ico + ' ' if len(ico) == 1 and index < last_index else ico
+                for index, ico in enumerate(row_icons)))
 
-                res.append(ico)
+        self._print_lines(lines)
 
-            self._print(''.join(res))
+    def _clue_cells(self, is_column):
+        """
+        The rendered clues padded to the size of the header (side).
+        The columns clues are transposed to be drawn row by row.
 
-    def draw_header(self):
-        for i in range(self.header_height):
-            for j in range(self.side_width):
-                self.cells[i][j] = ThumbnailCell()
+        The clues do not change between frames, so they are calculated only once
+        (until the board's descriptions get replaced, e.g. on reducing).
+        """
+        if is_column:
+            descriptions, size = self.board.columns_descriptions, self.header_height
+        else:
+            descriptions, size = self.board.rows_descriptions, self.side_width
 
-        for j, col in enumerate(self.board.columns_descriptions):
-            rend_j = j + self.side_width
-            if not col:
-                col = [0]
+        cached = self._clues.get(is_column)
+        if cached is not None and cached[0] is descriptions:
+            return cached[1]
 
-            rend_column = [ClueCell(val) for val in col]
-            rend_column = pad(rend_column, self.header_height, Cell())
+        padding = Cell()
+        clues = []
+        for desc in descriptions:
+            if not desc:
+                desc = [0]
 
-            # self.cells[:self.header_height, rend_j] = rend_column
-            for i, cell in enumerate(rend_column):
-                self.cells[i][rend_j] = cell
+            clues.append(pad([ClueCell(val) for val in desc], size, padding))
+
+        if is_column:
+            clues = [list(row) for row in zip(*clues)]
+
+        self._clues[is_column] = descriptions, clues
+        return clues
+
+    def draw_header(self):
+        side_width = self.side_width
+        thumbnail = [ThumbnailCell()] * side_width
+
+        for i, rend_row in enumerate(self._clue_cells(True)):
+            self.cells[i][:side_width] = thumbnail
+            self.cells[i][side_width:side_width + len(rend_row)] = rend_row
 
     def draw_side(self):
-        for i, row in enumerate(self.board.rows_descriptions):
-            rend_i = i + self.header_height
-            # row = list(row)
-            if not row:
-                row = [0]
+        header_height = self.header_height
+        side_width = self.side_width
 
-            rend_row = [ClueCell(val) for val in row]
-            rend_row = pad(rend_row, self.side_width, Cell())
-            self.cells[rend_i][:self.side_width] = rend_row
+        for i, rend_row in enumerate(self._clue_cells(False)):
+            self.cells[i + header_height][:side_width] = rend_row
 
     def draw_grid(self, cells=None):
         if cells is None:
             cells = self.board.cells
 
-        is_colored = self.is_colored
+        side_width = self.side_width
+
+        for rend_i, row in enumerate(cells, self.header_height):
+            self.cells[rend_i][side_width:side_width + len(row)] = [
+                self._grid_cell(val) for val in row]
 
-        for i, row in enumerate(cells):
-            rend_i = i + self.header_height
-            for j, val in enumerate(row):
-                rend_j = j + self.side_width
-                self.cells[rend_i][rend_j] = GridCell(
-                    val, self, colored=is_colored)
+    def _grid_cell(self, value):
+        # the grid cells are immutable, so they can be reused
+        try:
+            return self._grid_cells[value]
+        except KeyError:
+            cell = GridCell(value, self, colored=self.is_colored)
+            self._grid_cells[value] = cell
+            return cell
 
 
 class AsciiRenderer(BaseAsciiRenderer):
@@ -442,37 +513,42 @@ class AsciiRenderer(BaseAsciiRenderer):
 
         return res.format(space_padding + ' ', space_padding)
 
-    def _value_row(self, values):
+    def _value_row(self, icons):
         sep = self.VERTICAL_GRID_SYMBOL
         bold_sep = self.BOLD_LINE_VERTICAL_SIZE * sep
+        side_width = self.side_width
 
-        for i, cell in enumerate(values):
-            if i == self.side_width:
+        for i, ico in enumerate(icons):
+            if i == side_width:
                 yield self._side_delimiter()
             else:
                 # only on a data area, every 5 column
-                if i > self.side_width and \
-                        (i - self.side_width) % self.BOLD_LINE_EVERY == 0:
+                if i > side_width and \
+                        (i - side_width) % self.BOLD_LINE_EVERY == 0:
                     yield bold_sep
                 else:
                     yield sep
 
-            yield self.cell_icon(cell)
+            yield ico
 
         yield sep
 
     def render(self):
+        icons = dict()
+        lines = []
+        header_height = self.header_height
         for i, row in enumerate(self.cells):
             if i == 0:
                 grid_row = self._grid_row(border=True)
-            elif i == self.header_height:
+            elif i == header_height:
                 grid_row = self._grid_row(header=True)
             else:
-                grid_row = self._grid_row(data_row_index=i - self.header_height)
-            self._print(grid_row)
-            self._print(''.join(self._value_row(row)))
+                grid_row = self._grid_row(data_row_index=i - header_height)
+            lines.append(grid_row)
+            lines.append(''.join(self._value_row(self._row_icons(row, icons))))
 
-        self._print(self._grid_row(border=True))
+        lines.append(self._grid_row(border=True))
+        self._print_lines(lines)
 
 
 class AsciiRendererWithBold(AsciiRenderer):
@@ -881,7 +957,7 @@ class SvgRenderer(StreamRenderer):
             class_='nonogram-grid'))
 
         cell_groups = dict()
-        for cell_value, id_ in iteritems(self.color_symbols):
+        for cell_value, id_ in self.color_symbols.items():
             cell_groups[cell_value] = drawing.g(class_=id_)
 
         space_cell = SPACE_COLORED if self.is_colored else SPACE
@@ -910,7 +986,7 @@ class SvgRenderer(StreamRenderer):
                 cell_groups[cell].add(icon)
 
         # to get predictable order
-        for cell_value, group in sorted(iteritems(cell_groups),
+        for cell_value, group in sorted(cell_groups.items(),
                                         key=lambda x: x[0]):
             drawing.add(group)
 
@@ -968,7 +1044,7 @@ class SvgRenderer(StreamRenderer):
 
 def _register_renderers():
     res = dict()
-    for obj in itervalues(globals()):
+    for obj in globals().values():
         if isinstance(obj, type):
             if issubclass(obj, StreamRenderer) and hasattr(obj, '__rend_name__'):
                 res[obj.__rend_name__] = obj
@@ -5,8 +5,10 @@ Enables general-purpose cache
 
 from __future__ import unicode_literals, print_function
 
-from collections import defaultdict
+from collections import OrderedDict
 from functools import wraps
+from itertools import count
+from heapq import heapify, heappush, heappop
 from time import time
 
 from pynogram.utils.other import get_named_logger
@@ -18,6 +20,7 @@ class Cache(object):
     """
     Presents the simple dictionary
     with size limit and hit counter.
+    When the size limit is reached, the least recently used items get dropped.
     """
 
     def __init__(self, max_size=10 ** 5, increase=False, do_not_increase_after=10 ** 6):
@@ -29,7 +32,7 @@ class Cache(object):
         :param do_not_increase_after: prevent the cache from growing
         at certain number of items
         """
-        self._storage = dict()
+        self._storage = OrderedDict()
         self.init_size = max_size
         self.max_size = max_size
         self.hits = 0
@@ -37,29 +40,51 @@ class Cache(object):
 
         if increase is True:
             increase = 2
+        elif increase and increase <= 1:
+            LOG.info('Bad increase multiplier: %s', increase)
+            increase = False
         self.increase = increase
         self.do_not_increase_after = do_not_increase_after
 
     def __len__(self):
         return len(self._storage)
 
-    def _clear(self):
-        self._storage.clear()
+    def __contains__(self, name):
+        return name in self._storage
 
     def save(self, name, value, **kwargs):
         """Write the value to cache."""
 
-        if len(self) >= self.max_size:
-            LOG.warning('Maximum size for cache reached (%s).', self.max_size)
-
-            self._clear()
-            self._increase_size()
+        # overwriting the stored item does not need any space
+        if name not in self and len(self) >= self.max_size:
+            if not self._increase_size():
+                self._evict()
 
         self._save(name, value, **kwargs)
 
+    def _evict(self):
+        """Drop the least recently used item"""
+        self._storage.popitem(last=False)
+
+    # choose the implementation once, as it runs on every cache hit
+    if hasattr(OrderedDict, 'move_to_end'):
+        def _refresh(self, name):
+            """Mark the item as the most recently used"""
+            self._storage.move_to_end(name)
+
+    else:  # PY2
+        def _refresh(self, name):
+            """Mark the item as the most recently used"""
+            self._storage[name] = self._storage.pop(name)
+
     # noinspection PyUnusedLocal
     def _save(self, name, value, **kwargs):
-        self._storage[name] = value
+        if name in self._storage:
+            self._storage[name] = value
+            self._refresh(name)
+        else:
+            # new items are always added to the end
+            self._storage[name] = value
 
     def get(self, name):
         """Get the value from a cache"""
@@ -74,17 +99,22 @@ class Cache(object):
         return value
 
     def _get(self, name):
-        return self._storage.get(name)
+        value = self._storage.get(name)
+        if value is not None:
+            self._refresh(name)
+
+        return value
 
     def _increase_size(self):
-        if self.max_size >= self.do_not_increase_after:
-            return
+        """Return whether the size was actually increased"""
+        if not self.increase or self.max_size >= self.do_not_increase_after:
+            return False
 
-        if self.increase and self.increase > 1:
-            new_max = self.max_size * self.increase
-            self.max_size = min(new_max, self.do_not_increase_after)
-        else:
-            LOG.info('Bad increase multiplier: %s', self.increase)
+        new_max = min(self.max_size * self.increase, self.do_not_increase_after)
+        LOG.warning('Maximum size for cache reached (%s). Increase it to %s.',
+                    self.max_size, new_max)
+        self.max_size = new_max
+        return True
 
     def delete(self, name):
         """Just drop the value from a cache"""
@@ -104,44 +134,98 @@ class Cache(object):
 class ExpirableCache(Cache):
     """
     The cache with limited support for expiration.
+
+    Only the items saved with a timeout have their expiration time tracked,
+    so getting the other items costs the same as in the simple `Cache`.
     """
 
-    # TODO: make thread to expire objects
+    def __init__(self, *args, **kwargs):
+        super(ExpirableCache, self).__init__(*args, **kwargs)
+        self._expire_at = dict()
+        # (expiration time, order, name) triples to find the expired items quickly,
+        # the order resolves the ties, so the names never get compared
+        self._expiration_heap = []
+        self._expiration_order = count()
+
+    def save(self, name, value, **kwargs):
+        if name not in self and len(self) >= self.max_size:
+            # try to free some space before dropping the live items
+            self._drop_expired()
+        super(ExpirableCache, self).save(name, value, **kwargs)
 
     def _save(self, name, value, **kwargs):
         """Optionally you can specify an expiration timeout"""
+        super(ExpirableCache, self)._save(name, value)
+
         _time = kwargs.get('time')
-        self._storage[name] = (time(), _time, value)
+        if _time is None:
+            self._expire_at.pop(name, None)
+        else:
+            expire_at = time() + _time
+            self._expire_at[name] = expire_at
+            heappush(self._expiration_heap,
+                     (expire_at, next(self._expiration_order), name))
 
-    def _get(self, name):
-        item = self._storage.get(name)
+            # the triples of re-saved or dropped items are useless, so get rid of them
+            if len(self._expiration_heap) > 2 * len(self._expire_at):
+                self._rebuild_expiration_heap()
 
-        if item is None:
+    def _rebuild_expiration_heap(self):
+        order = self._expiration_order
+        self._expiration_heap = [
+            (expire_at, next(order), name) for name, expire_at in self._expire_at.items()]
+        heapify(self._expiration_heap)
+
+    def _get(self, name):
+        value = super(ExpirableCache, self)._get(name)
+        if value is None:
             return None
 
-        start, _time, value = item
-        # expires
-        if _time is not None and time() - start > _time:
+        expire_at = self._expire_at.get(name)
+        if expire_at is not None and time() > expire_at:
             self.delete(name)
 
         return value
 
+    def _drop_expired(self):
+        """
+        Free the space occupied by expired items
+        """
+        heap = self._expiration_heap
+        if not heap:
+            return
+
+        now = time()
+        while heap and heap[0][0] < now:
+            expire_at, _, name = heappop(heap)
+            # the item can be already dropped or saved again with another timeout
+            if self._expire_at.get(name) == expire_at:
+                self.delete(name)
+
+    def _evict(self):
+        name, _ = self._storage.popitem(last=False)
+        self._expire_at.pop(name, None)
+
+    def delete(self, name):
+        self._expire_at.pop(name, None)
+        return super(ExpirableCache, self).delete(name)
+
 
 def memoized_two_args(func, cache=None):  # pragma: no cover
     """
     Memoize results of two-argument function.
-    The first argument should be more 'volatile' and the second one more 'constant'.
+    The results are stored in a flat dictionary keyed by the pair of arguments.
     """
     if cache is None:
-        cache = defaultdict(dict)
+        cache = dict()
 
     @wraps(func)
     def wrapper(arg1, arg2):
-        arg2_cache = cache[arg2]
+        key = arg1, arg2
         try:
-            return arg2_cache[arg1]
+            return cache[key]
         except KeyError:
-            arg2_cache[arg1] = value = func(arg1, arg2)
+            cache[key] = value = func(arg1, arg2)
             return value
 
     return wrapper
@@ -15,7 +15,12 @@ from datetime import datetime
 from functools import wraps
 from threading import Lock
 
-from memoized import memoized
+try:
+    from functools import lru_cache
+except ImportError:  # python < 3.2
+    # noinspection PyUnresolvedReferences,PyPackageRequirements
+    from backports.functools_lru_cache import lru_cache
+
 from six import (
     text_type,
     iteritems,
@@ -144,7 +149,7 @@ def log_call(log_func=print):  # pragma: no cover
     return _decorator
 
 
-@memoized
+@lru_cache(maxsize=None)
 def two_powers(num):
     """
     Get a 'factorization' of number into powers of 2:
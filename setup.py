@@ -46,12 +46,12 @@ LICENSE = 'Apache License 2.0',
 
 REQUIRED = [
     'six',
-    'memoized',
     'svgwrite',
 ]
 
 # http://setuptools.readthedocs.io/en/latest/setuptools.html#declaring-extras-optional-features-with-their-own-dependencies
 REQUIRED_EXTRAS = {
+    ':python_version < "3.2"': ['backports.functools_lru_cache'],
     'web: python_version < "3.2"': ['futures'],
     'web': ['tornado'],
 }
@@ -83,6 +83,16 @@ class TestBoard(object):
             (),
         ])
 
+    def test_same_descriptions_shared(self, board):
+        columns = board.columns_descriptions
+        rows = board.rows_descriptions
+
+        # [9] and 9, '4' and 4, [2, 2] and (2, 2)
+        assert columns[1] is columns[2]
+        assert columns[3] is columns[4]
+        assert columns[5] is columns[6]
+        assert rows[3] is rows[4] is columns[3]
+
     def test_bad_renderer(self):
         with pytest.raises(TypeError) as ei:
             # noinspection PyTypeChecker
@@ -5,6 +5,7 @@ from __future__ import unicode_literals, print_function
 import time
 
 from pynogram.core.line.base import TwoLayerCache
+from pynogram.utils import cache
 from pynogram.utils.cache import (
     Cache,
     ExpirableCache,
@@ -29,9 +30,50 @@ class TestCache(object):
             assert c.get('foo') == 42
             c.save(i, i)
 
-        assert c.get('foo') is None
+        # the cache grows instead of dropping the items
+        assert c.get('foo') == 42
+        assert len(c) == 11
         assert c.max_size == 20
 
+    def test_least_recently_used_dropped(self):
+        c = Cache(3)
+        c.save('foo', 1)
+        c.save('bar', 2)
+        c.save('baz', 3)
+
+        assert c.get('foo') == 1
+        c.save('qux', 4)
+
+        assert len(c) == 3
+        assert c.get('bar') is None
+        assert c.get('foo') == 1
+        assert c.get('baz') == 3
+        assert c.get('qux') == 4
+
+    def test_overwrite_does_not_evict(self):
+        c = Cache(2)
+        c.save('foo', 1)
+        c.save('bar', 2)
+
+        assert c.get('foo') == 1
+        c.save('foo', 3)
+
+        assert len(c) == 2
+        assert c.get('foo') == 3
+        assert c.get('bar') == 2
+
+    def test_overwritten_becomes_recently_used(self):
+        c = Cache(2)
+        c.save('foo', 1)
+        c.save('bar', 2)
+        c.save('foo', 3)
+        c.save('baz', 4)
+
+        assert len(c) == 2
+        assert c.get('bar') is None
+        assert c.get('foo') == 3
+        assert c.get('baz') == 4
+
     def test_expiration(self):
         c = ExpirableCache(10)
         c.save('foo', 42, time=0.000001)
@@ -44,6 +86,58 @@ class TestCache(object):
         assert c.get('foo') == 42
         assert c.get('foo') is None
 
+    def test_expired_dropped_before_evicting(self):
+        c = ExpirableCache(2)
+        c.save('foo', 42)
+        c.save('bar', 28, time=0.000001)
+
+        time.sleep(0.01)
+        c.save('baz', 1)
+
+        assert len(c) == 2
+        assert c.get('bar') is None
+        assert c.get('foo') == 42
+        assert c.get('baz') == 1
+
+    def test_expiration_reset(self):
+        c = ExpirableCache(10)
+        c.save('foo', 42, time=0.000001)
+        c.save('foo', 43)
+
+        time.sleep(0.01)
+        c.save('bar', 28)
+
+        assert c.get('foo') == 43
+        assert c.get('foo') == 43
+
+    def test_expiration_heap_does_not_grow(self):
+        c = ExpirableCache(10)
+        for i in range(1000):
+            c.save('foo', i, time=60)
+
+        for i in range(1000):
+            c.save(i, i, time=60)
+            c.delete(i)
+
+        assert len(c) == 1
+        # noinspection PyProtectedMember
+        assert len(c._expiration_heap) <= 3
+        assert c.get('foo') == 999
+
+    def test_expiration_ties_with_incomparable_names(self, monkeypatch):
+        monkeypatch.setattr(cache, 'time', lambda: 1000.0)
+
+        c = ExpirableCache(10)
+        c.save('foo', 1, time=60)
+        c.save(1, 2, time=60)
+        c.save(None, 3, time=60)
+
+        # noinspection PyProtectedMember
+        c._rebuild_expiration_heap()
+        assert c.get('foo') == 1
+        assert c.get(1) == 2
+        assert c.get(None) == 3
+
     def test_hit_rate(self):
         c = Cache(10)
 
@@ -77,7 +171,10 @@ class TestCache(object):
                 assert c.get('foo') == 42
                 c.save(i, i)
 
-            assert c.get('foo') is None
+            assert c.get('foo') == 42
+            assert c.get('first') is None
+            assert c.max_size == 10
+            assert len(c) == 10
 
     def test_do_not_increase(self):
         c = Cache(10, increase=True, do_not_increase_after=15)
@@ -86,18 +183,20 @@ class TestCache(object):
         for i in range(10):
             assert c.get('foo') == 42
             c.save(i, i)
-        assert c.get('foo') is None
 
         assert c.max_size == 15
 
-        c.save('foo', 42)
-        for i in range(15):
-            assert c.get('foo') == 42
+        for i in range(10, 25):
             c.save(i, i)
-        assert c.get('foo') is None
 
         # do not increase after 15
         assert c.max_size == 15
+        assert len(c) == 15
+
+        # the oldest items dropped
+        assert c.get('foo') is None
+        assert c.get(9) is None
+        assert c.get(10) == 10
 
     def test_nonogram_cache(self):
         c = TwoLayerCache(5)
@@ -115,3 +214,26 @@ class TestCache(object):
         assert len(c) == 1
         # noinspection PyProtectedMember
         assert list(c._storage) == ['foo']
+
+    def test_nonogram_cache_overwrite_does_not_evict(self):
+        c = TwoLayerCache(2)
+        c.save(('baz', 'bar'), 2)
+        c.save(('foo', 'bar'), 1)
+        c.save(('foo', 'bar'), 3)
+
+        assert len(c) == 2
+        assert c.get(('foo', 'bar')) == 3
+        assert c.get(('baz', 'bar')) == 2
+
+    def test_nonogram_cache_saved_clue_becomes_recently_used(self):
+        c = TwoLayerCache(3)
+        c.save(('foo', 'x'), 1)
+        c.save(('bar', 'y'), 2)
+        c.save(('foo', 'z'), 3)
+        c.save(('baz', 'w'), 4)
+
+        assert len(c) == 3
+        assert c.get(('bar', 'y')) is None
+        assert c.get(('foo', 'x')) == 1
+        assert c.get(('foo', 'z')) == 3
+        assert c.get(('baz', 'w')) == 4
@@ -6,14 +6,24 @@ from copy import copy
 
 import pytest
 
+try:
+    # noinspection PyPackageRequirements
+    import numpy as np
+except ImportError:
+    np = None
+
 from pynogram.core.common import (
     UNKNOWN, BOX, SPACE, SPACE_COLORED,
     normalize_row,
     NonogramError,
 )
-from pynogram.core.line import solve_line
+from pynogram.core.line import (
+    solve_line,
+    solve_lines_batch,
+)
 from pynogram.core.line.machine import (
     BaseMachineSolver,
+    ReverseTrackingSolver,
     assert_match,
 )
 from pynogram.utils.fsm import (
@@ -257,64 +267,24 @@ class TestNonogramFSMReverseTracking(TestNonogramFiniteStateMachine):
         # assert solve_line((description, input_row)) == tuple(expected)
         assert solve_line(description, input_row, method='reverse_tracking') == tuple(expected)
 
-    def test_transition_table(self):
-        description, row = '2 2', '___0X_____'
+    @pytest.mark.skipif(np is None, reason='requires numpy')
+    @pytest.mark.parametrize('description,input_row,expected', CASES)
+    def test_solve_with_kernel(self, description, input_row, expected):
         nfsm = BaseMachineSolver.make_nfsm(description)
+        row = normalize_row(input_row)
+        assert tuple(nfsm.solve_with_kernel(row)) == tuple(expected)
 
-        row = normalize_row(row)
-        # noinspection PyProtectedMember
-        transition_table = nfsm._make_transition_table(row)
-        # TODO: assert string representation
-        assert str(transition_table) == '\n'.join([
-            '0',
-            '(1): []',
-            '',
-            '1',
-            '(1): [1<-False]',
-            '(2): [1<-True]',
-            '',
-            '2',
-            '(1): [1<-False]',
-            '(2): [1<-True]',
-            '(3): [2<-True]',
-            '',
-            '3',
-            '(1): [1<-False]',
-            '(2): [1<-True]',
-            '(3): [2<-True]',
-            '(4): [3<-False]',
-            '',
-            '4',
-            '(1): [1<-False]',
-            '(4): [3<-False, 4<-False]',
-            '',
-            '5',
-            '(2): [1<-True]',
-            '(5): [4<-True]',
-            '',
-            '6',
-            '(3): [2<-True]',
-            '(6): [5<-True]',
-            '',
-            '7',
-            '(4): [3<-False]',
-            '(6): [6<-False]',
-            '',
-            '8',
-            '(4): [4<-False]',
-            '(5): [4<-True]',
-            '(6): [6<-False]',
-            '',
-            '9',
-            '(4): [4<-False]',
-            '(5): [4<-True]',
-            '(6): [5<-True, 6<-False]',
-            '',
-            '10',
-            '(4): [4<-False]',
-            '(5): [4<-True]',
-            '(6): [5<-True, 6<-False]',
-        ])
+    @pytest.mark.skipif(np is None, reason='requires numpy')
+    def test_solve_with_kernel_bad_row(self):
+        nfsm = BaseMachineSolver.make_nfsm('1 1')
+        with pytest.raises(NonogramError, match='final state 4 not found'):
+            nfsm.solve_with_kernel(normalize_row('__.'))
+
+    @pytest.mark.skipif(np is not None, reason='requires numpy to be absent')
+    def test_solve_with_kernel_without_numpy(self):
+        nfsm = BaseMachineSolver.make_nfsm('1 1')
+        with pytest.raises(RuntimeError, match='requires numpy'):
+            nfsm.solve_with_kernel(normalize_row('___'))
 
     def test_solve_bad_row(self):
         with pytest.raises(NonogramError) as ie:
@@ -324,6 +294,21 @@ class TestNonogramFSMReverseTracking(TestNonogramFiniteStateMachine):
                                  '(None, None, False) with clues (1, 1): '
                                  'Bad transition table: final state 4 not found')
 
+    def test_machine_shared_between_solvers(self):
+        first = ReverseTrackingSolver((1, 1), (UNKNOWN,) * 3)
+        second = ReverseTrackingSolver((1, 1), (UNKNOWN,) * 5)
+        assert first.nfsm is second.nfsm
+
+        other = ReverseTrackingSolver((2,), (UNKNOWN,) * 3)
+        assert other.nfsm is not first.nfsm
+
+    def test_solve_batch(self):
+        descriptions = [description for description, _, _ in CASES]
+        lines = [input_row for _, input_row, _ in CASES]
+
+        solved = solve_lines_batch(descriptions, lines, processes=2)
+        assert solved == [tuple(expected) for _, _, expected in CASES]
+
     def test_solve_bad_method(self):
         with pytest.raises(KeyError) as ie:
             solve_line('1 1', '___', method='brute_force')
@@ -47,6 +47,14 @@ class TestRenderer(object):
         renderer.board_init(BlackBoard([], []))
         assert prev_board != id(renderer.board)
 
+    def test_clues_size_follows_descriptions(self, renderer):
+        board = BlackBoard([[1, 1], 1, [1, 1]], [[1, 1], 1, [1, 1]])
+        renderer.board_init(board)
+        assert (renderer.header_height, renderer.side_width) == (2, 2)
+
+        board.columns_descriptions = ((3,), (), (1,))
+        assert (renderer.header_height, renderer.side_width) == (1, 2)
+
 
 # noinspection PyShadowingNames
 class TestConsoleBoard(object):